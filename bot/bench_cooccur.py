@@ -0,0 +1,68 @@
+# bot/bench_cooccur.py
+"""Time cooccur.joint_counts on synthetic days of N titles, then a year of
+stored history built from N-title days: save/load and the WTD/MTD/YTD sums.
+
+Usage: python bot/bench_cooccur.py [N ...]   (default: 1000 10000 50000)
+"""
+import datetime as dt, json, pathlib, random, string, sys, tempfile, time
+from charts import BRAND_SEED, tokenize, is_same_iso_week, is_in_month, is_in_year
+from output import save_json, load_json
+import cooccur
+
+HISTORY_DAYS = 365
+
+WORDS = ("holiday tariffs ai shoppers prices stores layoffs earnings delivery inventory "
+         "loyalty grocery apparel returns warehouse robots marketplace pharmacy "
+         "discounts membership sales forecast quarter supply chain").split()
+
+def synthetic_titles(n, seed=0):
+    rnd = random.Random(seed)
+    brands = sorted(BRAND_SEED)
+    filler = ["".join(rnd.choices(string.ascii_lowercase, k=7)) for _ in range(5000)]
+    titles = []
+    for _ in range(n):
+        words = rnd.sample(WORDS, 5) + rnd.sample(filler, 3)
+        if rnd.random() < 0.6:
+            words.insert(rnd.randrange(len(words)), rnd.choice(brands))
+        titles.append(" ".join(words))
+    return titles
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or [1000, 10000, 50000]
+    # warm-up: the first call pays for the lazy numpy/scipy import
+    cooccur.joint_counts(synthetic_titles(50), BRAND_SEED, tokenize)
+    for n in sizes:
+        titles = synthetic_titles(n)
+        t0 = time.perf_counter()
+        joint = cooccur.joint_counts(titles, BRAND_SEED, tokenize)
+        dt = time.perf_counter() - t0
+        pairs = sum(len(v) for v in joint.values())
+        print(f"{n:>7} titles  {dt*1000:8.1f} ms  {n/dt:10.0f} titles/s  {pairs} brand/term pairs")
+    for n in sizes:
+        bench_history(n)
+
+def bench_history(n, days=HISTORY_DAYS):
+    """A year of stored days (7 distinct synthetic days, repeated)."""
+    week = [cooccur.joint_counts(synthetic_titles(n, seed=s), BRAND_SEED, tokenize) for s in range(7)]
+    raw_kb = len(json.dumps(week[0], separators=(",", ":"))) / 1024
+    stored = [cooccur.prune(d) for d in week]
+    today = dt.date.today()
+    history = {(today - dt.timedelta(days=i)).isoformat(): stored[i % 7] for i in range(days)}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = pathlib.Path(tmp) / "history_cooccur.json"
+        t0 = time.perf_counter()
+        save_json(path, history)
+        t_save = time.perf_counter() - t0
+        size_mb = path.stat().st_size / 2**20
+        t0 = time.perf_counter()
+        history = {d: cooccur.prune(v) for d, v in load_json(path, {}, strict=True).items()}  # as charts does
+        t_load = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for pred in (is_same_iso_week, is_in_month, is_in_year):
+        cooccur.top_terms(cooccur.aggregate_window(history, pred))
+    t_agg = time.perf_counter() - t0
+    print(f"{n:>7} titles/day x {days} days  {raw_kb:6.0f} KB/day raw  {size_mb:6.1f} MB stored  "
+          f"save {t_save*1000:6.0f} ms  load+prune {t_load*1000:6.0f} ms  wtd+mtd+ytd {t_agg*1000:6.0f} ms")
+
+if __name__ == "__main__":
+    main()
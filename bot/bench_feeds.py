@@ -0,0 +1,50 @@
+# bot/bench_feeds.py
+"""Compare feed_stream against feedparser: parse time and peak memory per feed.
+
+Usage:
+  python bot/bench_feeds.py                 # download each FEEDS url once
+  python bot/bench_feeds.py feed1.xml ...   # use local files instead
+"""
+import io, sys, time, tracemalloc, pathlib, urllib.request
+import feedparser
+from feed_stream import parse_entries, FeedError, HEADERS
+
+def measure(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+def load_sources(args):
+    if args:
+        for a in args:
+            yield pathlib.Path(a).name, pathlib.Path(a).read_bytes()
+        return
+    from fetch import FEEDS
+    for name, url in FEEDS.items():
+        try:
+            req = urllib.request.Request(url, headers=HEADERS)
+            with urllib.request.urlopen(req, timeout=20) as resp:
+                yield name, resp.read()
+        except OSError as e:
+            print(f"skip {name}: {e}")
+
+def main(limit=25):
+    print(f"{'feed':24} {'KB':>7} {'fp ms':>8} {'fp peak KB':>11} {'stream ms':>10} {'stream peak KB':>15}")
+    for name, raw in load_sources(sys.argv[1:]):
+        fp_t, fp_mem = measure(lambda: feedparser.parse(raw).entries[:limit])
+        try:
+            st_t, st_mem = measure(lambda: parse_entries(io.BytesIO(raw), limit))
+            st = f"{st_t*1000:10.1f} {st_mem/1024:15.0f}"
+        except FeedError as e:
+            st = f"{'fallback':>10} ({e})"
+        print(f"{name[:24]:24} {len(raw)/1024:7.0f} {fp_t*1000:8.1f} {fp_mem/1024:11.0f} {st}")
+
+if __name__ == "__main__":
+    main()
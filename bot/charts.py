@@ -1,16 +1,11 @@
 # bot/charts.py
-import json, pathlib, re, collections, datetime as dt, traceback
-import matplotlib
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
+import io, json, pathlib, re, collections, datetime as dt, traceback
+import cooccur
+from output import save_json, load_json, write_bytes
 
 ROOT   = pathlib.Path(".")
 DATA   = ROOT / "data"
 ASSETS = ROOT / "assets"
-ASSETS.mkdir(parents=True, exist_ok=True)
-
-TODAY = dt.date.today()
-TODAY_ISO = TODAY.isoformat()
 
 # -------------------------
 # Config
@@ -53,18 +48,22 @@ def load_articles():
         print("charts.py: failed to parse headlines.json\n", traceback.format_exc())
         return []
 
-def save_json(path: pathlib.Path, payload):
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+def pyplot():
+    """matplotlib is by far the slowest import here; load it only when plotting."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    return plt
 
 def distinct_colors(n: int):
-    cmap = plt.get_cmap("tab20")
+    cmap = pyplot().get_cmap("tab20")
     return [cmap(i % 20) for i in range(n)]
 
 def plot_bar(counter: collections.Counter, title: str, outfile_no_ext: str):
     pairs = counter.most_common(12)
     labels = [p[0] for p in pairs][::-1]
     values = [p[1] for p in pairs][::-1]
+    plt = pyplot()
     plt.figure(figsize=(8.5, 5))
     if values:
         colors = distinct_colors(len(values))
@@ -81,30 +80,35 @@ def plot_bar(counter: collections.Counter, title: str, outfile_no_ext: str):
         plt.axis("off")
     plt.title(title)
     plt.tight_layout()
-    plt.savefig(ASSETS/f"{outfile_no_ext}.png", dpi=160, bbox_inches="tight")
-    plt.savefig(ASSETS/f"{outfile_no_ext}.svg", bbox_inches="tight")
+    for ext, opts in (("png", {"dpi": 160}), ("svg", {})):
+        buf = io.BytesIO()
+        plt.savefig(buf, format=ext, bbox_inches="tight", **opts)
+        write_bytes(ASSETS/f"{outfile_no_ext}.{ext}", buf.getvalue())
     plt.close()
     print(f"✓ Wrote assets/{outfile_no_ext}.png and .svg")
 
 # Windows
-def is_same_iso_week(day_iso: str) -> bool:
+def is_same_iso_week(day_iso: str, today=None) -> bool:
+    today = today or dt.date.today()
     try:
         d = dt.date.fromisoformat(day_iso)
-        return d.isocalendar()[:2] == TODAY.isocalendar()[:2]  # (ISO year, ISO week)
+        return d.isocalendar()[:2] == today.isocalendar()[:2]  # (ISO year, ISO week)
     except Exception:
         return False
 
-def is_in_month(day_iso: str) -> bool:
+def is_in_month(day_iso: str, today=None) -> bool:
+    today = today or dt.date.today()
     try:
         d = dt.date.fromisoformat(day_iso)
-        return d.year == TODAY.year and d.month == TODAY.month
+        return d.year == today.year and d.month == today.month
     except Exception:
         return False
 
-def is_in_year(day_iso: str) -> bool:
+def is_in_year(day_iso: str, today=None) -> bool:
+    today = today or dt.date.today()
     try:
         d = dt.date.fromisoformat(day_iso)
-        return d.year == TODAY.year
+        return d.year == today.year
     except Exception:
         return False
 
@@ -122,6 +126,7 @@ def normalize_history(h: dict) -> dict:
 # Main
 # -------------------------
 def main():
+    today_iso = dt.date.today().isoformat()
     arts = load_articles()
 
     # Today counts
@@ -136,14 +141,21 @@ def main():
             if b.lower() in lt:
                 br_day[b] += 1
 
+    # Brand × keyword co-occurrence (one sparse product for the whole day)
+    co_day = cooccur.joint_counts([a.get("title", "") for a in arts], BRAND_SEED, tokenize)
+
     # Persist daily history (keep ~400 days so YTD works)
     kw_hist_path = DATA/"history_keywords.json"
     br_hist_path = DATA/"history_brands.json"
-    kw_hist = json.loads(kw_hist_path.read_text(encoding="utf-8")) if kw_hist_path.exists() else {}
-    br_hist = json.loads(br_hist_path.read_text(encoding="utf-8")) if br_hist_path.exists() else {}
+    co_hist_path = DATA/"history_cooccur.json"
+    kw_hist = load_json(kw_hist_path, {}, strict=True)
+    br_hist = load_json(br_hist_path, {}, strict=True)
+    # older files hold every pair of every day; prune is idempotent on new ones
+    co_hist = {d: cooccur.prune(v) for d, v in load_json(co_hist_path, {}, strict=True).items()}
 
-    kw_hist[TODAY_ISO] = {k:int(v) for k,v in kw_day.items()}
-    br_hist[TODAY_ISO] = {k:int(v) for k,v in br_day.items()}
+    kw_hist[today_iso] = {k:int(v) for k,v in kw_day.items()}
+    br_hist[today_iso] = {k:int(v) for k,v in br_day.items()}
+    co_hist[today_iso] = cooccur.prune(co_day)
 
     def trim(h: dict):
         days = sorted(h.keys())[-400:]
@@ -151,9 +163,11 @@ def main():
 
     kw_hist = trim(kw_hist)
     br_hist = trim(br_hist)
+    co_hist = trim(co_hist)
 
     save_json(kw_hist_path, normalize_history(kw_hist))
     save_json(br_hist_path, normalize_history(br_hist))
+    save_json(co_hist_path, co_hist)
 
     # Aggregations: WTD (resets each ISO week), MTD, YTD
     kw_wtd = aggregate_window(kw_hist, is_same_iso_week)
@@ -187,6 +201,14 @@ def main():
         "ytd":     [{"brand":k,"count":int(v)} for k,v in br_ytd.most_common(20)],
     })
 
+    # Top associated terms per brand, per window
+    save_json(ASSETS/"brand_terms.json", {
+        "today":   cooccur.top_terms(cooccur.aggregate_window({today_iso: co_day}, lambda d: True)),
+        "wtd":     cooccur.top_terms(cooccur.aggregate_window(co_hist, is_same_iso_week)),
+        "mtd":     cooccur.top_terms(cooccur.aggregate_window(co_hist, is_in_month)),
+        "ytd":     cooccur.top_terms(cooccur.aggregate_window(co_hist, is_in_year)),
+    })
+
     # Simple categorization (kept as-is)
     import re as _re
     def categorize(title: str):
@@ -0,0 +1,88 @@
+# bot/check_import_time.py
+"""Import checks for the bot modules.
+
+Each module is imported cold in a fresh interpreter, in an empty scratch
+directory. The default (blocking) check is deterministic and fails if:
+  - the import pulled in a heavy library (matplotlib, numpy, scipy,
+    requests, bs4, PIL, feedparser) that should only load on use, or
+  - the import left anything behind in the scratch directory.
+
+  python bot/check_import_time.py            # exit 1 on either problem
+  python bot/check_import_time.py --timing   # also enforce millisecond budgets
+
+--timing adds `python -X importtime` budgets (best of --runs imports). They
+depend on the machine, so CI reports them without blocking the deploy.
+"""
+import argparse, ast, os, pathlib, re, subprocess, sys, tempfile
+
+BOT = pathlib.Path(__file__).resolve().parent
+
+HEAVY = {"matplotlib", "numpy", "scipy", "requests", "bs4", "PIL", "feedparser"}
+
+# module -> cold cumulative import budget in milliseconds (--timing only)
+BUDGETS_MS = {
+    "output": 50,
+    "search_index": 50,
+    "feed_stream": 40,
+    "cooccur": 25,
+    "fetch": 60,
+    "charts": 75,
+    "hero_from_articles": 60,
+    "site_builder": 60,
+    "serve": 90,
+}
+
+LINE_RE = re.compile(r"^import time:\s*\d+\s*\|\s*(\d+)\s*\|\s*(\S.*)$")
+
+def cold_import(module: str):
+    """(cumulative import ms, heavy libraries loaded, files left in an empty cwd)."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(BOT), os.environ.get("PYTHONPATH")])))
+    code = f"import {module}, sys; print(sorted(set({sorted(HEAVY)!r}) & {{m.split('.')[0] for m in sys.modules}}))"
+    with tempfile.TemporaryDirectory() as scratch:
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            cwd=scratch, env=env, capture_output=True, text=True,
+        )
+        leftovers = sorted(os.listdir(scratch))
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr.splitlines()[-1] if proc.stderr else ''}")
+    heavy = ast.literal_eval(proc.stdout.strip().splitlines()[-1])
+    for line in proc.stderr.splitlines():
+        m = LINE_RE.match(line)
+        if m and m.group(2).strip() == module:
+            return int(m.group(1)) / 1000, heavy, leftovers
+    raise RuntimeError(f"no importtime line for {module}")
+
+def main():
+    ap = argparse.ArgumentParser(description="Check that bot modules import cheaply and without side effects.")
+    ap.add_argument("--timing", action="store_true", help="also fail on millisecond budgets")
+    ap.add_argument("--runs", type=int, default=3, help="with --timing, take the best of N cold imports")
+    ap.add_argument("modules", nargs="*", help="subset of modules to check")
+    args = ap.parse_args()
+
+    failures = 0
+    for module in args.modules or BUDGETS_MS:
+        budget = BUDGETS_MS[module]
+        try:
+            results = [cold_import(module) for _ in range(args.runs if args.timing else 1)]
+        except RuntimeError as e:
+            print(f"✗ {module}: {e}")
+            failures += 1
+            continue
+        best = min(ms for ms, _, _ in results)
+        heavy = sorted({h for _, hs, _ in results for h in hs})
+        leftovers = sorted({f for _, _, files in results for f in files})
+        ok = not heavy and not leftovers and (best <= budget or not args.timing)
+        failures += not ok
+        notes = []
+        if heavy:
+            notes.append(f"loads {', '.join(heavy)}")
+        if leftovers:
+            notes.append(f"import created: {', '.join(leftovers)}")
+        note = f"  ({'; '.join(notes)})" if notes else ""
+        print(f"{'✓' if ok else '✗'} {module:20} {best:7.1f} ms / {budget} ms{note}")
+    if failures:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# bot/cooccur.py
+"""Brand × keyword co-occurrence via sparse incidence matrices.
+
+For one day's titles we build two binary CSR matrices — titles × brands (B)
+and titles × terms (K) — and a single product B.T @ K gives, for every
+brand/term pair, the number of titles mentioning both.
+
+Only each brand's top KEEP_PER_BRAND terms of a day are kept in history
+(see prune), so stored days and window sums stay small however many
+titles a day has.
+"""
+import collections
+
+KEEP_PER_BRAND = 25
+
+def own_terms(brand: str) -> set:
+    """Tokens of the brand's own name ('best', 'buy' for Best Buy)."""
+    return set(brand.lower().replace("’", "'").split())
+
+def incidence(rows_of_cols, n_cols):
+    """Binary CSR matrix with one row per title from per-title column-id sets."""
+    import numpy as np
+    from scipy import sparse
+    indptr = np.zeros(len(rows_of_cols) + 1, dtype=np.int64)
+    np.cumsum([len(c) for c in rows_of_cols], out=indptr[1:])
+    indices = np.fromiter((c for cols in rows_of_cols for c in cols), dtype=np.int32, count=int(indptr[-1]))
+    data = np.ones(len(indices), dtype=np.int32)
+    return sparse.csr_matrix((data, indices, indptr), shape=(len(rows_of_cols), n_cols))
+
+def joint_counts(titles, brands, tokenize) -> dict:
+    """{brand: {term: #titles mentioning both}} for one batch of titles."""
+    brands = sorted(brands)
+    brand_lc = [b.lower() for b in brands]
+    vocab = {}
+    br_rows, kw_rows = [], []
+    for t in titles:
+        lt = (t or "").lower()
+        br_rows.append(sorted({i for i, b in enumerate(brand_lc) if b in lt}))
+        kw_rows.append(sorted({vocab.setdefault(w, len(vocab)) for w in tokenize(t)}))
+    if not vocab or not any(br_rows):
+        return {}
+
+    B = incidence(br_rows, len(brands))
+    K = incidence(kw_rows, len(vocab))
+    J = (B.T @ K).tocoo()
+
+    terms = sorted(vocab, key=vocab.get)
+    out = {}
+    for b, w, n in zip(J.row, J.col, J.data):
+        out.setdefault(brands[b], {})[terms[w]] = int(n)
+    return out
+
+def prune(by_brand: dict, keep=KEEP_PER_BRAND) -> dict:
+    """One day's {brand: {term: n}} as stored: no self-terms, top `keep` per brand."""
+    out = {}
+    for brand, counts in by_brand.items():
+        own = own_terms(brand)
+        if len(counts) <= keep and not any(o in counts or o.replace("'", "’") in counts for o in own):
+            out[brand] = counts  # already stored form
+            continue
+        pairs = [(k, v) for k, v in counts.items() if k.replace("’", "'") not in own]
+        pairs.sort(key=lambda kv: (-kv[1], kv[0]))
+        if pairs:
+            out[brand] = dict(pairs[:keep])
+    return out
+
+def aggregate_window(history: dict, pred) -> dict:
+    """Sum per-day {brand: {term: n}} over days where pred(day) holds."""
+    total = collections.defaultdict(collections.Counter)
+    for day, by_brand in history.items():
+        if pred(day):
+            for brand, counts in by_brand.items():
+                total[brand].update(counts)
+    return total
+
+def top_terms(agg: dict, per_brand=8) -> dict:
+    """{brand: [{"token", "count"}]} ordered by the brand's total co-mentions."""
+    ranked = sorted(agg.items(), key=lambda kv: sum(kv[1].values()), reverse=True)
+    out = {}
+    for brand, counts in ranked:
+        own = own_terms(brand)
+        pairs = [(k, v) for k, v in counts.most_common() if k.replace("’", "'") not in own]
+        if pairs:
+            out[brand] = [{"token": k, "count": int(v)} for k, v in pairs[:per_brand]]
+    return out
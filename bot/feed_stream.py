@@ -0,0 +1,122 @@
+# bot/feed_stream.py
+"""Incremental RSS/Atom reader that stops as soon as enough entries are seen.
+
+feedparser builds the whole document (full HTML bodies included) before we
+slice off the first few entries. This reader pulls the XML in chunks, keeps
+only title/link/published for each item and stops reading the response once
+`limit` entries are collected. Anything it can't handle raises FeedError so
+the caller can fall back to feedparser.
+"""
+import html, re
+import xml.etree.ElementTree as ET
+
+CHUNK = 16 * 1024
+
+HEADERS = {
+    "User-Agent": "RetailTrendsBot/1.0 (+https://architeketh.github.io/retail-trends-bot/)"
+}
+
+# Local names of elements that hold one entry (RSS 2.0, RSS 1.0/RDF, Atom)
+ENTRY_TAGS = {"item", "entry"}
+PUBLISHED_TAGS = ("pubDate", "published", "date", "issued", "updated", "modified")
+ATOM_NS = "{http://www.w3.org/2005/Atom}"
+TAG_RE = re.compile(r"<[^>]+>")
+
+class FeedError(Exception):
+    """The stream could not be parsed; use feedparser instead."""
+
+def local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1] if isinstance(tag, str) else ""
+
+def text_of(el) -> str:
+    return " ".join("".join(el.itertext()).split())
+
+def title_of(el) -> str:
+    """Title text as feedparser reports it: RSS titles and Atom type="html"
+    titles carry escaped markup, so strip tags and unescape entities."""
+    text = text_of(el)
+    default = "text" if el.tag.startswith(ATOM_NS) else "html"
+    if el.get("type", default).lower() in ("html", "text/html"):
+        text = " ".join(html.unescape(TAG_RE.sub("", text)).split())
+    return text
+
+def entry_link(el) -> str:
+    fallback = ""
+    for child in el:
+        if local(child.tag) != "link":
+            continue
+        href = (child.get("href") or "").strip()
+        if not href:
+            # RSS: <link>https://…</link>
+            href = (child.text or "").strip()
+            if href:
+                return href
+            continue
+        rel = child.get("rel", "alternate")
+        if rel == "alternate":
+            return href
+        fallback = fallback or href
+    if fallback:
+        return fallback
+    # RSS items sometimes carry only a permalink guid
+    for child in el:
+        if local(child.tag) == "guid" and child.get("isPermaLink", "true") != "false":
+            return (child.text or "").strip()
+    return ""
+
+def entry_dict(el) -> dict:
+    fields = {}
+    for child in el:
+        name = local(child.tag)
+        if name not in fields and (name == "title" or name in PUBLISHED_TAGS):
+            fields[name] = title_of(child) if name == "title" else text_of(child)
+    published = next((fields[t] for t in PUBLISHED_TAGS if fields.get(t)), "")
+    return {
+        "title": fields.get("title", ""),
+        "link": entry_link(el),
+        "published": published,
+    }
+
+def parse_entries(fp, limit=25):
+    """Read entries from a binary file-like object, stopping after `limit`."""
+    parser = ET.XMLPullParser(events=("start", "end"))
+    entries = []
+    depth = 0  # >0 while inside an entry; nested entry-named tags are ignored
+    try:
+        while len(entries) < limit:
+            chunk = fp.read(CHUNK)
+            if not chunk:
+                parser.close()
+                break
+            parser.feed(chunk)
+            for event, el in parser.read_events():
+                if local(el.tag) not in ENTRY_TAGS:
+                    continue
+                if event == "start":
+                    depth += 1
+                    continue
+                depth -= 1
+                if depth:
+                    continue
+                entries.append(entry_dict(el))
+                el.clear()  # drop content:encoded etc. as soon as we're done
+                if len(entries) >= limit:
+                    break
+    except (ET.ParseError, ValueError, LookupError) as e:
+        # expat rejects some encoding declarations with ValueError (multi-byte
+        # codecs) or LookupError (unknown codec) rather than ParseError
+        raise FeedError(str(e)) from e
+    if not entries:
+        raise FeedError("no RSS/Atom entries found")
+    return entries
+
+def stream_entries(url: str, limit=25, timeout=20):
+    """Fetch `url` and return up to `limit` entries without reading the rest."""
+    import http.client, urllib.request  # pull in email etc.; only needed when fetching
+    req = urllib.request.Request(url, headers=HEADERS)
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            return parse_entries(resp, limit)
+    except (OSError, http.client.HTTPException, ValueError, LookupError) as e:
+        # IncompleteRead/BadStatusLine aren't OSErrors; any of these → feedparser
+        raise FeedError(f"fetch failed: {e!r}") from e
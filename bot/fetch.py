@@ -1,8 +1,9 @@
 # bot/fetch.py
-import feedparser, json, pathlib, datetime
+import pathlib, datetime
+from feed_stream import stream_entries, FeedError
+from output import save_json
 
 DATA = pathlib.Path("data")
-DATA.mkdir(parents=True, exist_ok=True)
 
 FEEDS = {
     "Retail Dive": "https://www.retaildive.com/feeds/news/",
@@ -16,8 +17,13 @@ def fetch_feeds(limit_per_feed=25):
     all_articles = []
     for source, url in FEEDS.items():
         print(f"Fetching {source} …")
-        feed = feedparser.parse(url)
-        entries = getattr(feed, "entries", []) or []
+        try:
+            entries = stream_entries(url, limit=limit_per_feed)
+        except FeedError as err:
+            print(f"  streaming parse failed ({err}); falling back to feedparser")
+            import feedparser
+            feed = feedparser.parse(url)
+            entries = getattr(feed, "entries", []) or []
         kept = 0
         for e in entries[:limit_per_feed]:
             title = e.get("title", "").strip()
@@ -37,9 +43,7 @@ def fetch_feeds(limit_per_feed=25):
         "fetched_at": datetime.datetime.utcnow().isoformat() + "Z",
         "articles": all_articles,
     }
-    (DATA / "headlines.json").write_text(
-        json.dumps(out, ensure_ascii=False, indent=2), encoding="utf-8"
-    )
+    save_json(DATA / "headlines.json", out)
     print(f"✓ Wrote {len(all_articles)} articles to data/headlines.json")
 
 if __name__ == "__main__":
@@ -2,17 +2,13 @@
 from __future__ import annotations
 import pathlib, json, datetime as dt, io, sys, traceback
 from urllib.parse import urljoin
-import requests
-from bs4 import BeautifulSoup
-from PIL import Image
+from output import save_json, write_bytes
 
 ROOT   = pathlib.Path(".")
 DATA   = ROOT / "data"
 HERO   = ROOT / "assets" / "hero"
-HERO.mkdir(parents=True, exist_ok=True)
 
 W, H = 1792, 1024
-TODAY = dt.date.today().isoformat()
 
 HEADERS = {
     "User-Agent": "RetailTrendsBot/1.0 (+https://architeketh.github.io/retail-trends-bot/)"
@@ -42,6 +38,9 @@ def absolutize(base, maybe):
         return maybe
 
 def find_og_image(url: str) -> str | None:
+    # requests/bs4 are imported here so runs with no articles never load them
+    import requests
+    from bs4 import BeautifulSoup
     try:
         r = requests.get(url, timeout=12, headers=HEADERS)
         r.raise_for_status()
@@ -59,6 +58,7 @@ def find_og_image(url: str) -> str | None:
     return None
 
 def download_image(img_url: str) -> bytes | None:
+    import requests
     try:
         r = requests.get(img_url, timeout=12, headers=HEADERS, stream=True)
         r.raise_for_status()
@@ -74,6 +74,7 @@ def download_image(img_url: str) -> bytes | None:
         return None
 
 def save_hero(img_bytes: bytes, meta: dict):
+    from PIL import Image
     im = Image.open(io.BytesIO(img_bytes)).convert("RGB")
     # center-crop to 16:9
     target_ratio = W / H
@@ -93,13 +94,16 @@ def save_hero(img_bytes: bytes, meta: dict):
     overlay = Image.new("RGB", (W, H), (8, 12, 28))
     im = Image.blend(im, overlay, 0.18)
 
-    out = HERO / f"{TODAY}.jpg"
-    im.save(out, "JPEG", quality=90, optimize=True)
-    im.save(HERO / "latest.jpg", "JPEG", quality=90, optimize=True)
-    (HERO / "latest.json").write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8")
+    out = HERO / f"{meta['date']}.jpg"
+    buf = io.BytesIO()
+    im.save(buf, "JPEG", quality=90, optimize=True)
+    write_bytes(out, buf.getvalue())
+    write_bytes(HERO / "latest.jpg", buf.getvalue())
+    save_json(HERO / "latest.json", meta)
     log(f"saved hero image: {out.name}")
 
 def main():
+    today = dt.date.today().isoformat()
     try:
         for a in read_articles():
             url   = a.get("link") or ""
@@ -114,7 +118,7 @@ def main():
             if not img_bytes:
                 continue
             save_hero(img_bytes, {
-                "date": TODAY,
+                "date": today,
                 "title": title,
                 "source": source,
                 "article_url": url,
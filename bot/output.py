@@ -0,0 +1,118 @@
+# bot/output.py
+"""Shared output layer: atomic writes, compact JSON, minified + precompressed site files.
+
+Every artifact is written to a temp file in the target directory and then
+renamed over the destination, so a crash mid-write leaves the previous file
+intact instead of a truncated one. Files published into site/ can also be
+minified and get .gz/.br siblings so static hosts can serve them as-is.
+"""
+import gzip, json, os, pathlib, re, tempfile
+
+try:
+    import brotli  # optional: .br siblings are skipped without it
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE = {".html", ".svg", ".json", ".css", ".js", ".xml", ".txt"}
+MIN_COMPRESS_BYTES = 256
+
+def write_bytes(path: pathlib.Path, data: bytes):
+    path = pathlib.Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp, 0o644)  # mkstemp creates 0600; published files must be world-readable
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+def write_text(path: pathlib.Path, text: str):
+    write_bytes(path, text.encode("utf-8"))
+
+def dumps(payload) -> str:
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+
+def save_json(path: pathlib.Path, payload):
+    write_text(path, dumps(payload))
+
+def load_json(path: pathlib.Path, default, strict=False):
+    """Read JSON from path; `default` if it's missing.
+
+    A file that exists but doesn't parse is reported, and with strict=True
+    raises instead of returning `default` — use that for files the caller
+    rewrites (histories, summaries, the search index) so a damaged file is
+    never silently replaced by an empty one.
+    """
+    path = pathlib.Path(path)
+    if not path.exists():
+        return default
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except Exception as e:
+        if strict:
+            raise ValueError(f"{path} is not valid JSON ({e}); refusing to overwrite it") from e
+        print(f"warning: ignoring unreadable {path}: {e}")
+        return default
+
+# ---------- Minifiers (tuned for the markup we generate) ----------
+RAW_BLOCK_RE = re.compile(r"(<(script|style|pre|textarea)\b[^>]*>)(.*?)(</\2>)", re.S | re.I)
+
+def minify_css(css: str) -> str:
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    return re.sub(r"\s*([{};,])\s*", r"\1", css).strip()
+
+def minify_js(js: str) -> str:
+    # Line breaks can end statements, so keep them; only drop indentation.
+    return "\n".join(line.strip() for line in js.splitlines() if line.strip())
+
+def minify_html(html: str) -> str:
+    raw = []
+    def stash(m):
+        name, body = m.group(2).lower(), m.group(3)
+        if name == "style":
+            body = minify_css(body)
+        elif name == "script":
+            body = minify_js(body)
+        raw.append(body)
+        return f"{m.group(1)}\x00{len(raw) - 1}\x00{m.group(4)}"
+    html = RAW_BLOCK_RE.sub(stash, html)
+    html = re.sub(r"<!--(?!\[).*?-->", "", html, flags=re.S)
+    html = re.sub(r">\s*\n\s*<", "><", html)
+    html = re.sub(r"\s{2,}|\n", " ", html)
+    return re.sub(r"\x00(\d+)\x00", lambda m: raw[int(m.group(1))], html).strip()
+
+def minify_svg(svg: str) -> str:
+    svg = re.sub(r"<!--.*?-->", "", svg, flags=re.S)
+    svg = re.sub(r">\s+<", "><", svg)
+    return re.sub(r"\s+", " ", svg).strip()
+
+MINIFIERS = {".html": minify_html, ".svg": minify_svg}
+
+def publish(path: pathlib.Path, data):
+    """Write a site file atomically (minified if HTML/SVG) plus .gz/.br siblings."""
+    path = pathlib.Path(path)
+    ext = path.suffix.lower()
+    if isinstance(data, str):
+        data = MINIFIERS.get(ext, lambda s: s)(data).encode("utf-8")
+    elif ext in MINIFIERS:
+        data = MINIFIERS[ext](data.decode("utf-8")).encode("utf-8")
+    write_bytes(path, data)
+
+    gz, br = path.with_name(path.name + ".gz"), path.with_name(path.name + ".br")
+    if ext not in COMPRESSIBLE or len(data) < MIN_COMPRESS_BYTES:
+        for p in (gz, br):
+            if p.exists():
+                p.unlink()
+        return
+    write_bytes(gz, gzip.compress(data, compresslevel=9, mtime=0))
+    if brotli is not None:
+        write_bytes(br, brotli.compress(data, quality=11))
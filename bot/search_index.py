@@ -0,0 +1,195 @@
+# bot/search_index.py
+"""Incremental, sharded inverted index over every headline we have fetched.
+
+Layout under data/search/ (copied verbatim to site/search/):
+  manifest.json      {"version", "docs", "doc_shard", "shards": [prefix, ...]}
+  docs_<n>.json      [[title, link, source, date], ...]  ids n*doc_shard ...
+  terms_<pp>.json    {term: [delta-encoded doc ids]}     pp = first 2 chars
+  links.json         {link: doc id}   dedupe set; build-side only, not published
+
+Doc ids only ever grow, so adding a headline appends to the posting lists
+of its terms and touches only the shards those terms live in; earlier doc
+shards are full and never reread. The page loads
+the manifest, then just the term shards for the query and the doc shards for
+the hits.
+
+manifest.json is written last and is the commit point: doc ids >= its "docs"
+count belong to an interrupted update. They are cut from doc shards and
+posting lists on the next update, and the page ignores them meanwhile.
+
+The published copy under site/search/ holds everything but links.json, so a
+lost data/search/ can be seeded back from the live site (see seed).
+"""
+import json, pathlib, re
+from output import save_json, load_json
+
+DOC_SHARD = 500
+VERSION = 1
+
+TERM_RE = re.compile(r"[a-z0-9]+")
+STOP = {
+    "a","an","the","and","or","of","to","in","on","at","by","for","with","from","as",
+    "is","are","was","be","it","its","this","that","s","vs",
+}
+
+def terms(text: str):
+    out = []
+    for t in TERM_RE.findall((text or "").lower()):
+        if len(t) > 1 and t not in STOP and t not in out:
+            out.append(t)
+    return out
+
+def prefix(term: str) -> str:
+    return term[:2]
+
+def decode(deltas):
+    out, last = [], 0
+    for d in deltas:
+        last += d
+        out.append(last)
+    return out
+
+def encode(ids):
+    out, last = [], 0
+    for i in ids:
+        out.append(i - last)
+        last = i
+    return out
+
+def committed(table: dict, n_docs: int) -> dict:
+    """Drop posting ids at or past the manifest's doc count (uncommitted)."""
+    out = {}
+    for t, deltas in table.items():
+        ids = [i for i in decode(deltas) if i < n_docs]
+        if ids:
+            out[t] = encode(ids)
+    return out
+
+def update(articles, day: str, out_dir: pathlib.Path) -> int:
+    """Add unseen articles (by link) to the index in out_dir. Returns # added.
+
+    Each doc is dated with the article's own "day" if it has one, else `day`.
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest = load_json(out_dir / "manifest.json", {}, strict=True)
+    if manifest.get("version") != VERSION or manifest.get("doc_shard") != DOC_SHARD:
+        manifest = {"version": VERSION, "docs": 0, "doc_shard": DOC_SHARD, "shards": []}
+    n_docs = start = int(manifest["docs"])
+    shards = set(manifest["shards"])
+
+    # Only the last, partly filled doc shard can grow; anything in it (or in
+    # later shards) past manifest["docs"] is from a crashed run
+    doc_shards = {}
+    dirty_docs = set()
+    tail = n_docs // DOC_SHARD
+    if n_docs % DOC_SHARD:
+        docs = load_json(out_dir / f"docs_{tail}.json", [], strict=True)
+        keep = n_docs - tail * DOC_SHARD
+        if len(docs) > keep:
+            dirty_docs.add(tail)
+        doc_shards[tail] = docs[:keep]
+    first_free = (n_docs + DOC_SHARD - 1) // DOC_SHARD
+    orphans = [p for p in out_dir.glob("docs_*.json") if int(p.stem[len("docs_"):]) >= first_free]
+    interrupted = bool(dirty_docs or orphans)
+
+    links_path = out_dir / "links.json"
+    migrated = False
+    if links_path.exists() or not n_docs:
+        links = {k: v for k, v in load_json(links_path, {}, strict=True).items() if v < n_docs}
+    else:
+        # index predates links.json: rebuild it once from the doc shards
+        links = {}
+        for i in range(first_free):
+            docs = doc_shards.get(i) or load_json(out_dir / f"docs_{i}.json", [], strict=True)
+            for j, d in enumerate(docs[:n_docs - i * DOC_SHARD]):
+                links[d[1]] = i * DOC_SHARD + j
+        migrated = True
+
+    new_postings = {}
+    for a in articles:
+        title = (a.get("title") or "").strip()
+        link = (a.get("link") or "").strip()
+        if not title or not link or link in links:
+            continue
+        doc_id = links[link] = n_docs
+        n_docs += 1
+        shard = doc_id // DOC_SHARD
+        doc_shards.setdefault(shard, []).append([title, link, a.get("source") or "", a.get("day") or day])
+        dirty_docs.add(shard)
+        for t in terms(title):
+            new_postings.setdefault(t, []).append(doc_id)
+
+    if not dirty_docs and not interrupted and not migrated:
+        return 0
+
+    for i in dirty_docs:
+        save_json(out_dir / f"docs_{i}.json", doc_shards[i])
+    for path in orphans:
+        if int(path.stem[len("docs_"):]) not in dirty_docs:
+            path.unlink()
+
+    by_prefix = {}
+    for t, ids in new_postings.items():
+        by_prefix.setdefault(prefix(t), {})[t] = ids
+    if interrupted:
+        # The crashed run may have appended to any term shard (or created new
+        # ones the manifest never listed): scrub them all back to committed ids.
+        for path in out_dir.glob("terms_*.json"):
+            p = path.stem[len("terms_"):]
+            if p in by_prefix:
+                continue  # scrubbed below before appending
+            table = committed(load_json(path, {}, strict=True), start) if p in shards else {}
+            if table:
+                save_json(path, dict(sorted(table.items())))
+            else:
+                path.unlink()
+                shards.discard(p)
+    for p, additions in by_prefix.items():
+        path = out_dir / f"terms_{p}.json"
+        table = committed(load_json(path, {}, strict=True), start) if p in shards else {}
+        for t, ids in additions.items():
+            deltas = table.setdefault(t, [])
+            last = sum(deltas)
+            for doc_id in ids:
+                deltas.append(doc_id - last)
+                last = doc_id
+        save_json(path, dict(sorted(table.items())))
+        shards.add(p)
+
+    save_json(links_path, links)
+
+    # commit point: only now do the new ids become visible
+    manifest["docs"] = n_docs
+    manifest["shards"] = sorted(shards)
+    save_json(out_dir / "manifest.json", manifest)
+    return n_docs - start
+
+def seed(base_url: str, out_dir: pathlib.Path, timeout=20) -> int:
+    """Download a published index (site/search/ at base_url) into out_dir.
+
+    Shards are written first and manifest.json last, so a failed download
+    leaves no manifest and the next update starts clean. links.json isn't
+    published; update rebuilds it from the doc shards. Returns # docs.
+    Raises OSError (incl. HTTP errors) or ValueError on failure.
+    """
+    import urllib.request  # only needed when the local index is missing
+
+    def get(name):
+        req = urllib.request.Request(base_url.rstrip("/") + "/" + name,
+                                     headers={"User-Agent": "RetailTrendsBot/1.0"})
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            return json.loads(resp.read().decode("utf-8"))
+
+    manifest = get("manifest.json")
+    if manifest.get("version") != VERSION or manifest.get("doc_shard") != DOC_SHARD:
+        raise ValueError(f"published index has version {manifest.get('version')!r}, "
+                         f"doc_shard {manifest.get('doc_shard')!r}")
+    n_docs = int(manifest["docs"])
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for i in range((n_docs + DOC_SHARD - 1) // DOC_SHARD):
+        save_json(out_dir / f"docs_{i}.json", get(f"docs_{i}.json"))
+    for p in manifest["shards"]:
+        save_json(out_dir / f"terms_{p}.json", get(f"terms_{p}.json"))
+    (out_dir / "links.json").unlink(missing_ok=True)  # stale ids; rebuilt on update
+    save_json(out_dir / "manifest.json", manifest)
+    return n_docs
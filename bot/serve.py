@@ -0,0 +1,135 @@
+# bot/serve.py
+"""Warm watch/serve mode for working on the dashboard.
+
+Loads the site state once, polls data/ and assets/ for changes and re-runs
+only the stages a changed file feeds, while serving site/ over HTTP:
+
+  python bot/serve.py                       # http://127.0.0.1:8000
+  python bot/serve.py --fetch-every 30      # also refetch feeds every 30 min
+
+A new data/headlines.json re-runs charts (and the search index); the files
+charts rewrites are then picked up in the same cycle. Heavy libraries stay
+imported between rebuilds, so each rebuild costs only the work it needs.
+"""
+import argparse, functools, threading, time, traceback
+import site_builder as sb
+
+# path (relative to ROOT) -> (site_builder loaders to refresh, stages to re-run)
+RULES = {
+    "data/headlines.json":         ((), ("search",)),
+    "data/history_keywords.json":  (("history",), ("summaries", "index", "archive")),
+    "data/history_brands.json":    (("history",), ("summaries", "index", "archive")),
+    "data/summaries.json":         (("summaries",), ("archive",)),
+    "data/categorized.json":       (("categorized",), ("search", "index")),
+    "assets/categorized.json":     (("categorized",), ("search", "index")),
+    "assets/headlines.json":       ((), ("search",)),
+    "assets/kw_totals.json":       (("totals",), ("index",)),
+    "assets/brand_totals.json":    (("totals",), ("index",)),
+    "assets/brand_terms.json":     (("brand_terms",), ("index",)),
+}
+# Charts, hero image and anything else under assets/ only need the page rebuilt
+DEFAULT_ASSET_RULE = ((), ("index",))
+IGNORED = ("data/search/", "data/history_cooccur.json")
+
+def log(msg): print(f"[serve] {msg}", flush=True)
+
+def scan() -> dict:
+    """{relative posix path: mtime_ns} for every watched file."""
+    out = {}
+    for base in (sb.DATA, sb.ASSETS):
+        for p in base.rglob("*"):
+            rel = p.relative_to(sb.ROOT).as_posix()
+            if rel.startswith(IGNORED) or p.name.startswith(".") or not p.is_file():
+                continue
+            try:
+                out[rel] = p.stat().st_mtime_ns
+            except OSError:
+                pass
+    return out
+
+def changed(before: dict, after: dict) -> set:
+    return {k for k in before.keys() | after.keys() if before.get(k) != after.get(k)}
+
+def plan(paths) -> tuple:
+    loaders, stages = set(), set()
+    for rel in paths:
+        rule = RULES.get(rel) or (DEFAULT_ASSET_RULE if rel.startswith("assets/") else ((), ()))
+        loaders.update(rule[0])
+        stages.update(rule[1])
+    # keep site_builder's own ordering
+    return ([k for k in sb.LOADERS if k in loaders], [k for k in sb.STAGES if k in stages])
+
+def run_charts():
+    import charts  # matplotlib is imported once and stays warm
+    charts.main()
+
+def rebuild(state: dict, paths, with_charts: bool):
+    t0 = time.perf_counter()
+    if with_charts and "data/headlines.json" in paths:
+        run_charts()
+    loaders, stages = plan(paths)
+    sb.stamp(state)
+    for name in loaders:
+        sb.LOADERS[name](state)
+    for name in stages:
+        sb.STAGES[name](state)
+    log(f"{', '.join(sorted(paths))} -> {', '.join(stages) or 'nothing'} ({time.perf_counter() - t0:.2f}s)")
+
+def serve(port: int):
+    from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+    class QuietHandler(SimpleHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+    handler = functools.partial(QuietHandler, directory=str(sb.SITE))
+    httpd = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    log(f"serving {sb.SITE}/ at http://127.0.0.1:{port}/")
+    return httpd
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--port", type=int, default=8000)
+    ap.add_argument("--interval", type=float, default=1.0, help="seconds between change scans")
+    ap.add_argument("--no-serve", action="store_true", help="watch and rebuild only")
+    ap.add_argument("--no-charts", action="store_true", help="don't re-run charts when headlines change")
+    ap.add_argument("--fetch-every", type=float, default=0, help="minutes between feed fetches (0 = never)")
+    args = ap.parse_args()
+
+    sb.ensure_dirs()
+    state = sb.load_state()
+    for stage in sb.STAGES.values():
+        stage(state)
+    if not args.no_serve:
+        serve(args.port)
+
+    snapshot = scan()
+    next_fetch = time.monotonic() if args.fetch_every > 0 else None
+    log("watching data/ and assets/ (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(args.interval)
+            try:
+                if next_fetch is not None and time.monotonic() >= next_fetch:
+                    import fetch
+                    fetch.fetch_feeds()
+                    next_fetch = time.monotonic() + args.fetch_every * 60
+                paths = changed(snapshot, scan())
+                if paths:
+                    rebuild(state, paths, with_charts=not args.no_charts)
+                    if not args.no_charts and "data/headlines.json" in paths:
+                        # pick up what charts wrote in the same cycle
+                        more = changed(snapshot, scan()) - paths
+                        if more:
+                            rebuild(state, more, with_charts=False)
+            except Exception:
+                log("rebuild failed (still watching):")
+                log(traceback.format_exc())
+            # our own writes (summaries.json, search shards) shouldn't retrigger
+            snapshot = scan()
+    except KeyboardInterrupt:
+        log("stopped")
+
+if __name__ == "__main__":
+    main()
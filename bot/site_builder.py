@@ -1,5 +1,7 @@
 # bot/site_builder.py
-import pathlib, json, datetime, random, shutil
+import pathlib, json, datetime, os, random
+import search_index
+from output import save_json, load_json, publish, write_bytes
 
 # ---------- Paths ----------
 ROOT = pathlib.Path(".")
@@ -7,74 +9,118 @@ DATA = ROOT / "data"
 ASSETS = ROOT / "assets"
 SITE = ROOT / "site"
 SITE_ASSETS = SITE / "assets"
+SEARCH = DATA / "search"
+SITE_SEARCH = SITE / "search"
 
+ORDER = ["Retail","eCommerce","AI","Supply Chain","Big Box","Luxury","Vintage","Other"]
 
-for p in (DATA, ASSETS, SITE_ASSETS):
-    p.mkdir(parents=True, exist_ok=True)
+def ensure_dirs():
+    for p in (DATA, ASSETS, SITE_ASSETS):
+        p.mkdir(parents=True, exist_ok=True)
 
 def esc(s: str) -> str:
     return (s or "").replace("&","&amp;").replace("<","&lt;").replace(">","&gt;")
 
+def copy_into_site(src: pathlib.Path, dst: pathlib.Path):
+    """Publish src at dst if it's newer: text formats minified + precompressed, binaries as-is."""
+    if dst.exists() and src.stat().st_mtime <= dst.stat().st_mtime:
+        return
+    if dst.suffix.lower() in (".svg", ".json", ".html"):
+        publish(dst, src.read_bytes())
+    else:
+        write_bytes(dst, src.read_bytes())
+
 def copy_into_site_assets(rel_path: pathlib.Path) -> str:
     """Copy ASSETS/<rel_path> → site/assets/<rel_path>. Return 'assets/...' URL or ''."""
     src = ASSETS / rel_path
     if not src.exists():
         return ""
-    dst = SITE_ASSETS / rel_path
-    dst.parent.mkdir(parents=True, exist_ok=True)
-    if not dst.exists() or src.stat().st_mtime > dst.stat().st_mtime:
-        shutil.copy2(src, dst)
+    copy_into_site(src, SITE_ASSETS / rel_path)
     return f"assets/{rel_path.as_posix()}"
 
-now = datetime.datetime.utcnow().strftime("%Y-%m-%d %H:%M UTC")
-today = datetime.date.today().isoformat()
-
-# ---------- Load categorized (optional) ----------
-cats = {}
-for p in (ASSETS / "categorized.json", DATA / "categorized.json"):
-    if p.exists():
-        try:
-            cats = json.loads(p.read_text(encoding="utf-8"))
-            break
-        except Exception:
-            cats = {}
-            break
+# ---------- Loaders (each fills part of the shared state dict) ----------
+def load_categorized(state: dict):
+    cats = {}
+    for p in (ASSETS / "categorized.json", DATA / "categorized.json"):
+        if p.exists():
+            try:
+                cats = json.loads(p.read_text(encoding="utf-8"))
+                break
+            except Exception:
+                cats = {}
+                break
+    state["cats"] = cats
 
-# ---------- Load totals (from assets) ----------
-kw_tot, br_tot = {}, {}
-try:
-    if (ASSETS / "kw_totals.json").exists():
-        kw_tot = json.loads((ASSETS / "kw_totals.json").read_text(encoding="utf-8"))
-    if (ASSETS / "brand_totals.json").exists():
-        br_tot = json.loads((ASSETS / "brand_totals.json").read_text(encoding="utf-8"))
-except Exception:
+def load_totals(state: dict):
     kw_tot, br_tot = {}, {}
+    try:
+        if (ASSETS / "kw_totals.json").exists():
+            kw_tot = json.loads((ASSETS / "kw_totals.json").read_text(encoding="utf-8"))
+        if (ASSETS / "brand_totals.json").exists():
+            br_tot = json.loads((ASSETS / "brand_totals.json").read_text(encoding="utf-8"))
+    except Exception:
+        kw_tot, br_tot = {}, {}
+    state["kw_tot"], state["br_tot"] = kw_tot, br_tot
 
-# ---------- Build TODAY signals ----------
-today_kw, today_br = [], []
-try:
-    hk = json.loads((DATA / "history_keywords.json").read_text(encoding="utf-8"))
-    hb = json.loads((DATA / "history_brands.json").read_text(encoding="utf-8"))
-except Exception:
-    hk, hb = {}, {}
-
-if isinstance(hk, dict) and today in hk:
-    today_kw = sorted(hk[today].items(), key=lambda kv: kv[1], reverse=True)
-if isinstance(hb, dict) and today in hb:
-    today_br = sorted(hb[today].items(), key=lambda kv: kv[1], reverse=True)
-
-if not today_kw:
-    for row in kw_tot.get("today", []):
-        today_kw.append((row.get("token", ""), int(row.get("count", 0))))
-    today_kw.sort(key=lambda kv: kv[1], reverse=True)
-
-if not today_br:
-    for row in br_tot.get("today", []):
-        today_br.append((row.get("brand", ""), int(row.get("count", 0))))
-    today_br.sort(key=lambda kv: kv[1], reverse=True)
-
-TOP_TODAY_KW = [k for k, _ in today_kw[:8] if k]
-TOP_TODAY_BR = [b for b, _ in today_br[:8] if b]
+def load_brand_terms(state: dict):
+    brand_terms = {}
+    try:
+        if (ASSETS / "brand_terms.json").exists():
+            brand_terms = json.loads((ASSETS / "brand_terms.json").read_text(encoding="utf-8"))
+    except Exception:
+        brand_terms = {}
+    state["brand_terms"] = brand_terms
+
+def load_history(state: dict):
+    state["hk"] = load_json(DATA / "history_keywords.json", {})
+    state["hb"] = load_json(DATA / "history_brands.json", {})
+
+def load_summaries(state: dict):
+    # build_summaries rewrites this file, so a damaged one must not read as {}
+    state["summaries"] = load_json(DATA / "summaries.json", {}, strict=True)
+
+LOADERS = {
+    "categorized": load_categorized,
+    "totals": load_totals,
+    "brand_terms": load_brand_terms,
+    "history": load_history,
+    "summaries": load_summaries,
+}
+
+def stamp(state: dict):
+    state["now"] = datetime.datetime.utcnow().strftime("%Y-%m-%d %H:%M UTC")
+    state["today"] = datetime.date.today().isoformat()
+
+def load_state() -> dict:
+    state = {}
+    stamp(state)
+    for load in LOADERS.values():
+        load(state)
+    return state
+
+# ---------- TODAY signals ----------
+def today_signals(state: dict):
+    """Top keywords/brands for today: history first, totals as fallback."""
+    today, hk, hb = state["today"], state["hk"], state["hb"]
+    today_kw, today_br = [], []
+    if isinstance(hk, dict) and today in hk:
+        today_kw = sorted(hk[today].items(), key=lambda kv: kv[1], reverse=True)
+    if isinstance(hb, dict) and today in hb:
+        today_br = sorted(hb[today].items(), key=lambda kv: kv[1], reverse=True)
+
+    if not today_kw:
+        for row in state["kw_tot"].get("today", []):
+            today_kw.append((row.get("token", ""), int(row.get("count", 0))))
+        today_kw.sort(key=lambda kv: kv[1], reverse=True)
+
+    if not today_br:
+        for row in state["br_tot"].get("today", []):
+            today_br.append((row.get("brand", ""), int(row.get("count", 0))))
+        today_br.sort(key=lambda kv: kv[1], reverse=True)
+
+    top_kw = [k for k, _ in today_kw[:8] if k]
+    top_br = [b for b, _ in today_br[:8] if b]
+    return top_kw, top_br
 
 # ---------- Daily sentence ----------
 lead_phrases = [
@@ -98,43 +144,37 @@ trend_phrases = [
     "reshaping focus on",
     "driving activity in",
 ]
-random.seed(today)
-
-brands_txt = ", ".join(TOP_TODAY_BR[:3]) if TOP_TODAY_BR else ""
-terms_txt  = ", ".join(TOP_TODAY_KW[:3]) if TOP_TODAY_KW else ""
-
-sentence = ""
-if brands_txt and terms_txt:
-    sentence = f"{random.choice(lead_phrases)} {brands_txt} {random.choice(brand_phrases)} {terms_txt}, {random.choice(trend_phrases)} retail, eCommerce, and AI."
-elif brands_txt:
-    sentence = f"{random.choice(lead_phrases)} {brands_txt}, {random.choice(trend_phrases)} retail, eCommerce, and AI."
-elif terms_txt:
-    sentence = f"{random.choice(lead_phrases)} {terms_txt}, {random.choice(trend_phrases)} retail, eCommerce, and AI."
-
-# Fallback if nothing else available
-if not sentence:
-    ORDER_FALLBACK = ["Retail","eCommerce","AI","Supply Chain","Big Box","Luxury","Vintage","Other"]
-    cat_counts = [(c, len(cats.get(c, []))) for c in ORDER_FALLBACK if cats.get(c)]
-    cat_counts.sort(key=lambda x: x[1], reverse=True)
-    if cat_counts:
-        topbits = ", ".join([f"{c} ({n})" for c, n in cat_counts[:3]])
-        sentence = f"Today’s coverage spans {topbits}, reflecting the latest shifts across the retail landscape."
-    else:
-        sentence = "Today’s coverage is light; updates will appear after the next successful fetch."
-
-daily_summary_sentence = sentence
-
-# ---------- Persist summaries.json + BACKFILL ----------
-sum_path = DATA / "summaries.json"
-all_summaries = {}
-if sum_path.exists():
-    try:
-        all_summaries = json.loads(sum_path.read_text(encoding="utf-8"))
-    except Exception:
-        all_summaries = {}
 
-def build_sentence_for_date(d: str) -> str:
+def daily_sentence(state: dict) -> str:
+    top_kw, top_br = today_signals(state)
+    rnd = random.Random(state["today"])
+
+    brands_txt = ", ".join(top_br[:3]) if top_br else ""
+    terms_txt  = ", ".join(top_kw[:3]) if top_kw else ""
+
+    sentence = ""
+    if brands_txt and terms_txt:
+        sentence = f"{rnd.choice(lead_phrases)} {brands_txt} {rnd.choice(brand_phrases)} {terms_txt}, {rnd.choice(trend_phrases)} retail, eCommerce, and AI."
+    elif brands_txt:
+        sentence = f"{rnd.choice(lead_phrases)} {brands_txt}, {rnd.choice(trend_phrases)} retail, eCommerce, and AI."
+    elif terms_txt:
+        sentence = f"{rnd.choice(lead_phrases)} {terms_txt}, {rnd.choice(trend_phrases)} retail, eCommerce, and AI."
+
+    # Fallback if nothing else available
+    if not sentence:
+        cats = state["cats"]
+        cat_counts = [(c, len(cats.get(c, []))) for c in ORDER if cats.get(c)]
+        cat_counts.sort(key=lambda x: x[1], reverse=True)
+        if cat_counts:
+            topbits = ", ".join([f"{c} ({n})" for c, n in cat_counts[:3]])
+            sentence = f"Today’s coverage spans {topbits}, reflecting the latest shifts across the retail landscape."
+        else:
+            sentence = "Today’s coverage is light; updates will appear after the next successful fetch."
+    return sentence
+
+def build_sentence_for_date(state: dict, d: str) -> str:
     """Create a short sentence for any date using history (brands/keywords)."""
+    hk, hb = state["hk"], state["hb"]
     brands = []
     terms = []
     if isinstance(hb, dict) and d in hb and isinstance(hb[d], dict):
@@ -150,33 +190,97 @@ def build_sentence_for_date(d: str) -> str:
         return f"Key themes include {', '.join(terms)} across retail and eCommerce."
     return "Coverage is light; updates will appear after the next successful fetch."
 
-# Ensure today's record exists
-if today not in all_summaries:
-    all_summaries[today] = {
-        "generated_at": now,
-        "summary": daily_summary_sentence or build_sentence_for_date(today),
-        "top_keywords": TOP_TODAY_KW,
-        "top_brands": TOP_TODAY_BR,
-    }
-else:
-    if not all_summaries[today].get("summary"):
-        all_summaries[today]["summary"] = daily_summary_sentence or build_sentence_for_date(today)
-        all_summaries[today]["generated_at"] = now
-
-# Backfill every known date
-all_dates = set(all_summaries.keys()) | (set(hk.keys()) if isinstance(hk, dict) else set()) | (set(hb.keys()) if isinstance(hb, dict) else set())
-for d in sorted(all_dates):
-    rec = all_summaries.get(d) or {}
-    if not rec.get("summary"):
-        rec["summary"] = build_sentence_for_date(d)
-        if "top_keywords" not in rec and isinstance(hk, dict) and d in hk and isinstance(hk[d], dict):
-            rec["top_keywords"] = [k for k, _ in sorted(hk[d].items(), key=lambda kv: kv[1], reverse=True)[:8]]
-        if "top_brands" not in rec and isinstance(hb, dict) and d in hb and isinstance(hb[d], dict):
-            rec["top_brands"] = [k for k, _ in sorted(hb[d].items(), key=lambda kv: kv[1], reverse=True)[:8]]
-        rec.setdefault("generated_at", now)
-        all_summaries[d] = rec
-
-sum_path.write_text(json.dumps(all_summaries, ensure_ascii=False, indent=2), encoding="utf-8")
+# ---------- Persist summaries.json + BACKFILL ----------
+def build_summaries(state: dict):
+    today, now, hk, hb = state["today"], state["now"], state["hk"], state["hb"]
+    all_summaries = state["summaries"]
+    daily_summary_sentence = daily_sentence(state)
+    top_kw, top_br = today_signals(state)
+
+    # Ensure today's record exists
+    if today not in all_summaries:
+        all_summaries[today] = {
+            "generated_at": now,
+            "summary": daily_summary_sentence or build_sentence_for_date(state, today),
+            "top_keywords": top_kw,
+            "top_brands": top_br,
+        }
+    else:
+        if not all_summaries[today].get("summary"):
+            all_summaries[today]["summary"] = daily_summary_sentence or build_sentence_for_date(state, today)
+            all_summaries[today]["generated_at"] = now
+
+    # Backfill every known date
+    all_dates = set(all_summaries.keys()) | (set(hk.keys()) if isinstance(hk, dict) else set()) | (set(hb.keys()) if isinstance(hb, dict) else set())
+    for d in sorted(all_dates):
+        rec = all_summaries.get(d) or {}
+        if not rec.get("summary"):
+            rec["summary"] = build_sentence_for_date(state, d)
+            if "top_keywords" not in rec and isinstance(hk, dict) and d in hk and isinstance(hk[d], dict):
+                rec["top_keywords"] = [k for k, _ in sorted(hk[d].items(), key=lambda kv: kv[1], reverse=True)[:8]]
+            if "top_brands" not in rec and isinstance(hb, dict) and d in hb and isinstance(hb[d], dict):
+                rec["top_brands"] = [k for k, _ in sorted(hb[d].items(), key=lambda kv: kv[1], reverse=True)[:8]]
+            rec.setdefault("generated_at", now)
+            all_summaries[d] = rec
+
+    save_json(DATA / "summaries.json", all_summaries)
+
+# ---------- Search index (all headlines ever fetched) ----------
+def headline_day(article: dict, fallback: str) -> str:
+    """ISO date an article was published, from its RSS/ISO 'published' field."""
+    from email.utils import parsedate_to_datetime
+    pub = (article.get("published") or "").strip()
+    if pub[:4].isdigit():
+        return pub[:10]
+    try:
+        return parsedate_to_datetime(pub).date().isoformat()
+    except (TypeError, ValueError, IndexError):
+        return fallback
+
+def stored_headlines(today: str):
+    """Every headline kept in the repo, oldest sources first, dated where we can."""
+    fetched = load_json(DATA / "headlines.json", {})
+    fetched = fetched if isinstance(fetched, dict) else {}
+    fetched_day = (fetched.get("fetched_at") or today)[:10]
+    batches = []
+    for p in (DATA / "categorized.json", ASSETS / "categorized.json"):
+        cats = load_json(p, {})
+        if isinstance(cats, dict):
+            batches.extend(v for v in cats.values() if isinstance(v, list))
+    legacy = load_json(ASSETS / "headlines.json", [])
+    batches.append(legacy if isinstance(legacy, list) else legacy.get("articles", []))
+    batches.append(fetched.get("articles", []))
+    for batch in batches:
+        for a in batch:
+            if isinstance(a, dict):
+                yield {**a, "day": headline_day(a, fetched_day)}
+
+def seed_search():
+    """Recover a missing data/search/ from the deployed site/search/.
+
+    CI keeps data/search/ in a best-effort cache; if that is evicted, the
+    live site still has the full index. SEARCH_SEED_URL names it (unset:
+    local builds start from the stored headlines only).
+    """
+    url = os.environ.get("SEARCH_SEED_URL", "").strip()
+    if not url or (SEARCH / "manifest.json").exists():
+        return
+    try:
+        n = search_index.seed(url, SEARCH)
+        print(f"✓ Search index: seeded {n} headlines from {url}")
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        print(f"⚠ Search index: data/search/manifest.json is missing and seeding from {url} failed ({e!r}); "
+              "rebuilding from stored headlines only, older headlines will drop out of search")
+
+def build_search(state: dict):
+    seed_search()
+    # Already-indexed links are skipped, so re-feeding stored headlines each
+    # build only costs the dedupe lookups; it seeds a fresh or lost index.
+    added = search_index.update(stored_headlines(state["today"]), state["today"], SEARCH)
+    for src in SEARCH.glob("*.json"):
+        if src.name != "links.json":  # build-side dedupe set, not for the page
+            copy_into_site(src, SITE_SEARCH / src.name)
+    print(f"✓ Search index: {added} new headlines")
 
 # ---------- HTML helpers ----------
 def chart_src(name: str) -> str:
@@ -216,72 +320,10 @@ def totals_block(title: str, data: dict, key: str, label_key: str):
         + f"<div class='small'><span class='muted'>Top:</span> {top}</div>"
     )
 
-# ---------- Category ordering ----------
-ORDER = ["Retail","eCommerce","AI","Supply Chain","Big Box","Luxury","Vintage","Other"]
-ordered = [(k, cats.get(k, [])) for k in ORDER if cats.get(k)] + [(k, v) for k, v in cats.items() if k not in ORDER]
+def ordered_categories(cats: dict):
+    return [(k, cats.get(k, [])) for k in ORDER if cats.get(k)] + [(k, v) for k, v in cats.items() if k not in ORDER]
 
-# ---------- Build index.html ----------
-html = []
-html.append("<!doctype html><html lang='en'><head>")
-html.append("<meta charset='utf-8'><meta name='viewport' content='width=device-width,initial-scale=1'>")
-html.append("<title>Retail Trends – Dashboard</title>")
-html.append("""
-<style>
-:root{--bg:#0b1220;--card:#0e172a;--text:#e5e7eb;--muted:#cbd5e1;--stroke:#1f2a44;--chip:#1e293b}
-*{box-sizing:border-box}
-body{margin:0;background:var(--bg);color:var(--text);font-family:system-ui,-apple-system,Segoe UI,Roboto,Arial,sans-serif;line-height:1.45}
-a,a:visited{color:#fff;text-decoration:none} a:hover{text-decoration:underline}
-.wrap{max-width:1200px;margin:0 auto;padding:22px 14px}
-@media(min-width:768px){.wrap{padding:26px 18px}}
-.hero{border:1px solid var(--stroke);border-radius:16px;padding:22px;margin-bottom:18px;
-       background:linear-gradient(135deg,#0ea5e9 0%, #7c3aed 40%, #22c55e 75%, #ef4444 100%);}
-.hero h1{margin:0 0 8px 0;font-size:28px;letter-spacing:.4px}
-@media(min-width:768px){.hero h1{font-size:32px}}
-.hero p{margin:0;color:#f1f5f9}
-.grid2{display:grid;gap:12px} @media(min-width:900px){.grid2{grid-template-columns:1fr 1fr;gap:16px}}
-.card{background:var(--card);border:1px solid var(--stroke);border-radius:12px;padding:14px}
-@media(min-width:768px){.card{padding:16px}}
-h2{margin:0 0 10px 0;font-size:18px}
-.muted{color:var(--muted)} .small{font-size:12px} .note{color:var(--muted)}
-ul{margin:0;padding-left:18px} li{margin:6px 0}
-img{max-width:100%;border-radius:12px}
-.badge{display:inline-block;background:#1f2937;color:#a7f3d0;border:1px solid #1f2a44;border-radius:999px;padding:2px 8px;font-size:12px;margin-left:8px}
-.chips{display:flex;flex-wrap:wrap;gap:8px;margin-top:10px}
-.chip{background:#1e293b;color:#fff;border:1px solid #1f2a44;padding:6px 10px;border-radius:999px;font-size:13px}
-.totals{display:grid;gap:12px} @media(min-width:900px){.totals{grid-template-columns:1.3fr 1fr 1fr}}
-.kv{display:grid;grid-template-columns:1fr auto;gap:8px}
-.table{width:100%;border-collapse:collapse;margin-top:8px;font-size:14px}
-.table th,.table td{border-bottom:1px solid var(--stroke);padding:8px 8px;text-align:left}
-.table th{color:#e2e8f0;font-weight:600}
-.anchor{scroll-margin-top:90px} .card a,.table a,.cat a{color:#fff}
-.footer{margin-top:16px;color:var(--muted);font-size:12px}
-</style>""")
-html.append("</head><body><div class='wrap'>")
-
-# Hero
-hero_src, hero_meta = latest_hero()
-html.append("<section class='hero'>")
-html.append("<h1>Retail Trends</h1>")
-html.append("<p>Daily retail headlines with week-to-date, month-to-date, and year-to-date trends.</p>")
-html.append("<div class='chips'>")
-for name in ORDER:
-    if cats.get(name):
-        slug = "cat-" + name.lower().replace(" ", "-")
-        html.append(f"<span class='chip'><a href='#{esc(slug)}'>{esc(name)}</a></span>")
-html.append("</div>")
-if hero_src:
-    html.append(f"<img src='{hero_src}' alt='Headline image' style='margin-top:10px'/>")
-    t = esc(hero_meta.get("title", "")); s = esc(hero_meta.get("source", "")); u = esc(hero_meta.get("article_url", ""))
-    if u and (t or s):
-        html.append(f"<div class='small muted' style='margin-top:6px'>Image from <a href='{u}' target='_blank' rel='noopener'>{t or s}</a></div>")
-html.append("</section>")
-
-# Daily AI Summary
-html.append("<section class='card'><h2>Daily AI Summary</h2>")
-html.append(f"<p>{esc(daily_summary_sentence)}</p></section>")
-
-# Totals
-def totals_group():
+def totals_group(ordered, kw_tot, br_tot):
     out = []
     out.append("<section class='card'><h2>Totals</h2><div class='totals'>")
     # Articles by category
@@ -311,9 +353,6 @@ def totals_group():
     out.append("</div></div></section>")
     return "".join(out)
 
-html.append(totals_group())
-
-# Charts
 def chart_row(title, key, lst, label_key):
     src = chart_src(key)
     tl = nice_list(lst, label_key) if lst else ""
@@ -321,62 +360,207 @@ def chart_row(title, key, lst, label_key):
     body = f"<img src='{src}' alt='{esc(title)}'/>" if src else "<p class='note'>No chart yet.</p>"
     return f"<article class='card'><h2>{esc(title)}</h2><div>{body}</div>{right}</article>"
 
-html.append("<section class='grid2'>")
-html.append(chart_row("Top Keywords — Today", "keywords_today", kw_tot.get("today", []), "token"))
-html.append(chart_row("Brand Mentions — Today", "brands_today", br_tot.get("today", []), "brand"))
-html.append("</section><section class='grid2' style='margin-top:16px'>")
-html.append(chart_row("Top Keywords — Week-to-date", "keywords_wtd", kw_tot.get("wtd", []), "token"))
-html.append(chart_row("Brand Mentions — Week-to-date", "brands_wtd", br_tot.get("wtd", []), "brand"))
-html.append("</section><section class='grid2' style='margin-top:16px'>")
-html.append(chart_row("Top Keywords — Month-to-date", "keywords_mtd", kw_tot.get("mtd", []), "token"))
-html.append(chart_row("Brand Mentions — Month-to-date", "brands_mtd", br_tot.get("mtd", []), "brand"))
-html.append("</section><section class='grid2' style='margin-top:16px'>")
-html.append(chart_row("Top Keywords — Year-to-date", "keywords_ytd", kw_tot.get("ytd", []), "token"))
-html.append(chart_row("Brand Mentions — Year-to-date", "brands_ytd", br_tot.get("ytd", []), "brand"))
-html.append("</section>")
-
-# Headlines by category
-html.append("<section class='card cat' style='margin-top:18px'><h2>Headlines by Category</h2>")
-if ordered:
-    for cat, items in ordered:
-        slug = "cat-" + cat.lower().replace(" ", "-")
-        html.append(f"<h3 id='{esc(slug)}' class='anchor'>{esc(cat)} <span class='badge'>{len(items)}</span></h3><ul>")
-        for a in items[:12]:
-            t = esc(a.get("title") or "(untitled)")
-            l = esc(a.get("link") or "#")
-            s = esc(a.get("source") or "")
-            span = f" <span class='muted'>({s})</span>" if s else ""
-            html.append(f"<li><a href='{l}' target='_blank' rel='noopener'>{t}</a>{span}</li>")
-        html.append("</ul>")
-else:
-    html.append("<p class='note'>No categorized headlines yet.</p>")
-year_now = datetime.datetime.utcnow().year
-html.append(f"</section><p class='footer'>Last updated {esc(now)} · © {year_now} Retail Trends Bot · <a href='archive.html'>Daily Summary Archive</a></p>")
-html.append("</div></body></html>")
-
-(SITE / "index.html").write_text("".join(html), encoding="utf-8")
-print("✓ Wrote site/index.html")
+def associations_block(brand_terms, limit=10):
+    for key, label in (("wtd", "week-to-date"), ("today", "today"), ("mtd", "month-to-date")):
+        rows = brand_terms.get(key) or {}
+        if rows:
+            break
+    out = ["<section class='card' style='margin-top:18px'><h2>What Drives Brand Coverage</h2>"]
+    if not rows:
+        out.append("<p class='note'>No brand/keyword associations yet.</p></section>")
+        return "".join(out)
+    out.append(f"<p class='small muted' style='margin:0'>Terms appearing in the same headlines as each brand ({label}).</p>")
+    out.append("<table class='table'><thead><tr><th>Brand</th><th>Top associated terms</th></tr></thead><tbody>")
+    for brand, terms in list(rows.items())[:limit]:
+        out.append(f"<tr><td>{esc(brand)}</td><td>{nice_list(terms, 'token', 6)}</td></tr>")
+    out.append("</tbody></table></section>")
+    return "".join(out)
+
+INDEX_STYLE = """
+<style>
+:root{--bg:#0b1220;--card:#0e172a;--text:#e5e7eb;--muted:#cbd5e1;--stroke:#1f2a44;--chip:#1e293b}
+*{box-sizing:border-box}
+body{margin:0;background:var(--bg);color:var(--text);font-family:system-ui,-apple-system,Segoe UI,Roboto,Arial,sans-serif;line-height:1.45}
+a,a:visited{color:#fff;text-decoration:none} a:hover{text-decoration:underline}
+.wrap{max-width:1200px;margin:0 auto;padding:22px 14px}
+@media(min-width:768px){.wrap{padding:26px 18px}}
+.hero{border:1px solid var(--stroke);border-radius:16px;padding:22px;margin-bottom:18px;
+       background:linear-gradient(135deg,#0ea5e9 0%, #7c3aed 40%, #22c55e 75%, #ef4444 100%);}
+.hero h1{margin:0 0 8px 0;font-size:28px;letter-spacing:.4px}
+@media(min-width:768px){.hero h1{font-size:32px}}
+.hero p{margin:0;color:#f1f5f9}
+.grid2{display:grid;gap:12px} @media(min-width:900px){.grid2{grid-template-columns:1fr 1fr;gap:16px}}
+.card{background:var(--card);border:1px solid var(--stroke);border-radius:12px;padding:14px}
+@media(min-width:768px){.card{padding:16px}}
+h2{margin:0 0 10px 0;font-size:18px}
+.muted{color:var(--muted)} .small{font-size:12px} .note{color:var(--muted)}
+ul{margin:0;padding-left:18px} li{margin:6px 0}
+img{max-width:100%;border-radius:12px}
+.badge{display:inline-block;background:#1f2937;color:#a7f3d0;border:1px solid #1f2a44;border-radius:999px;padding:2px 8px;font-size:12px;margin-left:8px}
+.chips{display:flex;flex-wrap:wrap;gap:8px;margin-top:10px}
+.chip{background:#1e293b;color:#fff;border:1px solid #1f2a44;padding:6px 10px;border-radius:999px;font-size:13px}
+.totals{display:grid;gap:12px} @media(min-width:900px){.totals{grid-template-columns:1.3fr 1fr 1fr}}
+.kv{display:grid;grid-template-columns:1fr auto;gap:8px}
+.table{width:100%;border-collapse:collapse;margin-top:8px;font-size:14px}
+.table th,.table td{border-bottom:1px solid var(--stroke);padding:8px 8px;text-align:left}
+.table th{color:#e2e8f0;font-weight:600}
+.anchor{scroll-margin-top:90px} .card a,.table a,.cat a{color:#fff}
+.footer{margin-top:16px;color:var(--muted);font-size:12px}
+</style>"""
+
+# Search over archived headlines (loads only the shards a query needs)
+SEARCH_BLOCK = """<section class='card' style='margin-top:18px'><h2>Search All Headlines</h2>
+<input id='q' type='search' placeholder='e.g. walmart holiday' autocomplete='off'
+ style='width:100%;padding:10px;border-radius:8px;border:1px solid var(--stroke);background:var(--chip);color:var(--text)'/>
+<p id='q-note' class='small muted' style='margin:8px 0 0 0'></p><ul id='q-results'></ul></section>
+<script>
+(()=>{
+const STOP=new Set(__STOP__), cache={}, get=u=>cache[u]||(cache[u]=fetch(u).then(r=>r.ok?r.json():{}).catch(()=>({})));
+const terms=q=>[...new Set((q.toLowerCase().match(/[a-z0-9]+/g)||[]).filter(t=>t.length>1&&!STOP.has(t)))];
+const decode=d=>{let x=0;return d.map(v=>x+=v)};
+const esc=s=>String(s).replace(/&/g,'&amp;').replace(/</g,'&lt;').replace(/>/g,'&gt;').replace(/'/g,'&#39;');
+const box=document.getElementById('q'),note=document.getElementById('q-note'),out=document.getElementById('q-results');
+let seq=0;
+async function run(){
+  const my=++seq, ts=terms(box.value); out.innerHTML='';
+  if(!ts.length){note.textContent='';return}
+  const m=await get('search/manifest.json'); if(!m.docs){note.textContent='Index not built yet.';return}
+  let hits=null;
+  for(let i=0;i<ts.length;i++){
+    const t=ts[i], p=t.slice(0,2), last=i===ts.length-1;
+    const tab=m.shards.includes(p)?await get('search/terms_'+p+'.json'):{};
+    const ids=new Set();
+    for(const k in tab){ if(k===t||(last&&k.startsWith(t))) decode(tab[k]).forEach(x=>{if(x<m.docs)ids.add(x)}) }
+    hits=hits?new Set([...hits].filter(x=>ids.has(x))):ids;
+    if(!hits.size)break;
+  }
+  if(my!==seq)return;
+  const ids=[...hits].sort((a,b)=>b-a), top=ids.slice(0,50);
+  note.textContent=ids.length+' match'+(ids.length===1?'':'es')+(ids.length>50?' (showing newest 50)':'');
+  const rows=[];
+  for(const id of top){
+    const docs=await get('search/docs_'+Math.floor(id/m.doc_shard)+'.json'), d=docs[id%m.doc_shard];
+    if(d)rows.push(`<li><a href='${esc(d[1])}' target='_blank' rel='noopener'>${esc(d[0])}</a> <span class='muted'>(${esc(d[2])} · ${esc(d[3])})</span></li>`);
+  }
+  if(my===seq)out.innerHTML=rows.join('');
+}
+let timer;box.addEventListener('input',()=>{clearTimeout(timer);timer=setTimeout(run,200)});
+})();
+</script>""".replace("__STOP__", json.dumps(sorted(search_index.STOP)))
+
+# ---------- Build index.html ----------
+def build_index(state: dict):
+    cats, kw_tot, br_tot = state["cats"], state["kw_tot"], state["br_tot"]
+    ordered = ordered_categories(cats)
+
+    html = []
+    html.append("<!doctype html><html lang='en'><head>")
+    html.append("<meta charset='utf-8'><meta name='viewport' content='width=device-width,initial-scale=1'>")
+    html.append("<title>Retail Trends – Dashboard</title>")
+    html.append(INDEX_STYLE)
+    html.append("</head><body><div class='wrap'>")
+
+    # Hero
+    hero_src, hero_meta = latest_hero()
+    html.append("<section class='hero'>")
+    html.append("<h1>Retail Trends</h1>")
+    html.append("<p>Daily retail headlines with week-to-date, month-to-date, and year-to-date trends.</p>")
+    html.append("<div class='chips'>")
+    for name in ORDER:
+        if cats.get(name):
+            slug = "cat-" + name.lower().replace(" ", "-")
+            html.append(f"<span class='chip'><a href='#{esc(slug)}'>{esc(name)}</a></span>")
+    html.append("</div>")
+    if hero_src:
+        html.append(f"<img src='{hero_src}' alt='Headline image' style='margin-top:10px'/>")
+        t = esc(hero_meta.get("title", "")); s = esc(hero_meta.get("source", "")); u = esc(hero_meta.get("article_url", ""))
+        if u and (t or s):
+            html.append(f"<div class='small muted' style='margin-top:6px'>Image from <a href='{u}' target='_blank' rel='noopener'>{t or s}</a></div>")
+    html.append("</section>")
+
+    # Daily AI Summary
+    html.append("<section class='card'><h2>Daily AI Summary</h2>")
+    html.append(f"<p>{esc(daily_sentence(state))}</p></section>")
+
+    # Totals
+    html.append(totals_group(ordered, kw_tot, br_tot))
+
+    # Charts
+    html.append("<section class='grid2'>")
+    html.append(chart_row("Top Keywords — Today", "keywords_today", kw_tot.get("today", []), "token"))
+    html.append(chart_row("Brand Mentions — Today", "brands_today", br_tot.get("today", []), "brand"))
+    html.append("</section><section class='grid2' style='margin-top:16px'>")
+    html.append(chart_row("Top Keywords — Week-to-date", "keywords_wtd", kw_tot.get("wtd", []), "token"))
+    html.append(chart_row("Brand Mentions — Week-to-date", "brands_wtd", br_tot.get("wtd", []), "brand"))
+    html.append("</section><section class='grid2' style='margin-top:16px'>")
+    html.append(chart_row("Top Keywords — Month-to-date", "keywords_mtd", kw_tot.get("mtd", []), "token"))
+    html.append(chart_row("Brand Mentions — Month-to-date", "brands_mtd", br_tot.get("mtd", []), "brand"))
+    html.append("</section><section class='grid2' style='margin-top:16px'>")
+    html.append(chart_row("Top Keywords — Year-to-date", "keywords_ytd", kw_tot.get("ytd", []), "token"))
+    html.append(chart_row("Brand Mentions — Year-to-date", "brands_ytd", br_tot.get("ytd", []), "brand"))
+    html.append("</section>")
+
+    # Brand × keyword associations
+    html.append(associations_block(state["brand_terms"]))
+
+    html.append(SEARCH_BLOCK)
+
+    # Headlines by category
+    html.append("<section class='card cat' style='margin-top:18px'><h2>Headlines by Category</h2>")
+    if ordered:
+        for cat, items in ordered:
+            slug = "cat-" + cat.lower().replace(" ", "-")
+            html.append(f"<h3 id='{esc(slug)}' class='anchor'>{esc(cat)} <span class='badge'>{len(items)}</span></h3><ul>")
+            for a in items[:12]:
+                t = esc(a.get("title") or "(untitled)")
+                l = esc(a.get("link") or "#")
+                s = esc(a.get("source") or "")
+                span = f" <span class='muted'>({s})</span>" if s else ""
+                html.append(f"<li><a href='{l}' target='_blank' rel='noopener'>{t}</a>{span}</li>")
+            html.append("</ul>")
+    else:
+        html.append("<p class='note'>No categorized headlines yet.</p>")
+    year_now = datetime.datetime.utcnow().year
+    html.append(f"</section><p class='footer'>Last updated {esc(state['now'])} · © {year_now} Retail Trends Bot · <a href='archive.html'>Daily Summary Archive</a></p>")
+    html.append("</div></body></html>")
+
+    publish(SITE / "index.html", "".join(html))
+    print("✓ Wrote site/index.html")
 
 # ---------- Build archive.html ----------
-try:
-    saved = json.loads((DATA / "summaries.json").read_text(encoding="utf-8"))
-except Exception:
-    saved = {}
-
-arch = []
-arch.append("<!doctype html><html lang='en'><head><meta charset='utf-8'><meta name='viewport' content='width=device-width,initial-scale=1'>")
-arch.append("<title>Daily Summary Archive – Retail Trends</title>")
-arch.append("""<style>
+def build_archive(state: dict):
+    saved = state["summaries"]
+
+    arch = []
+    arch.append("<!doctype html><html lang='en'><head><meta charset='utf-8'><meta name='viewport' content='width=device-width,initial-scale=1'>")
+    arch.append("<title>Daily Summary Archive – Retail Trends</title>")
+    arch.append("""<style>
 body{font-family:system-ui,-apple-system,Segoe UI,Roboto,Arial,sans-serif;margin:0;background:#0b1220;color:#e5e7eb}
 .wrap{max-width:1000px;margin:0 auto;padding:24px 16px}
 .card{background:#0e172a;border:1px solid #1f2a44;border-radius:12px;padding:16px;margin-bottom:14px}
 a{color:#fff;text-decoration:none} a:hover{text-decoration:underline}
 .muted{color:#cbd5e1}
 </style></head><body><div class='wrap'><h1>Daily Summary Archive</h1><p class='muted'>One-paragraph summaries saved each day.</p>""")
-for d, payload in sorted(saved.items(), key=lambda kv: kv[0], reverse=True):
-    line = payload.get("summary", "")
-    arch.append(f"<div class='card'><h3>{esc(d)}</h3><p>{esc(line)}</p></div>")
-arch.append("<p><a href='index.html'>← Back to dashboard</a></p></div></body></html>")
-
-(SITE / "archive.html").write_text("".join(arch), encoding="utf-8")
-print("✓ Wrote site/archive.html")
+    for d, payload in sorted(saved.items(), key=lambda kv: kv[0], reverse=True):
+        line = payload.get("summary", "")
+        arch.append(f"<div class='card'><h3>{esc(d)}</h3><p>{esc(line)}</p></div>")
+    arch.append("<p><a href='index.html'>← Back to dashboard</a></p></div></body></html>")
+
+    publish(SITE / "archive.html", "".join(arch))
+    print("✓ Wrote site/archive.html")
+
+STAGES = {
+    "summaries": build_summaries,
+    "search": build_search,
+    "index": build_index,
+    "archive": build_archive,
+}
+
+def main():
+    ensure_dirs()
+    state = load_state()
+    for stage in STAGES.values():
+        stage(state)
+
+if __name__ == "__main__":
+    main()